@@ -2,17 +2,28 @@ import os
 import tempfile
 import logging
 import json
+import mmap
 
 from utils.color import color_text, YELLOW, GREEN
-from utils.filesystem import get_repo_name
-from utils.directory import create_directory_tree, scan_directory
+from utils.filesystem import URL_PREFIXES, get_repo_name
+from utils.directory import scan_directory
 from git_utils.clone import clone_repo
 
+_SEPARATOR = b"=" * 48 + b"\n"
+
+def _decode_content(obj):
+    """
+    JSON fallback for raw file contents, decoded only for metadata.json.
+    Memory-mapped contents are decoded straight from the mapping.
+    """
+    if isinstance(obj, (bytes, mmap.mmap)):
+        return str(obj, "utf-8", "ignore")
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
 def process_directory(
     path: str,
     exclude,
     select,
-    verbose: bool,
     dry_run: bool,
     ignore_hidden: bool,
     output_folder: str,
@@ -21,37 +32,46 @@ def process_directory(
     Scans a local directory, creates a directory tree, and optionally writes outputs.
     """
     logging.info(f"Scanning directory: {path}")
-    files = scan_directory(path, exclude, select, verbose, ignore_hidden)
-    directory_tree = create_directory_tree(path)
-
-    # Combine directory tree + file contents
-    separator = "=" * 48 + "\n"
-    content_sections = []
-    for f in files:
-        section = (
-            f"{separator}File: {f['path']} "
-            f"({f['lines']} lines, {f['size']} bytes)\n"
-            f"{separator}{f['content']}\n"
-        )
-        content_sections.append(section)
-
-    final_content = directory_tree + "\n\n" + "\n".join(content_sections)
+    directory_tree, files = scan_directory(path, exclude, select, ignore_hidden)
 
     code_file = os.path.join(output_folder, "code.txt")
     metadata_file = os.path.join(output_folder, "metadata.json")
 
     if dry_run:
+        # Still drain the scan so debug logging reports every file
+        for _ in files:
+            pass
         logging.info(color_text("[DRY RUN] Files processed but no output written.", YELLOW))
         return
 
-    # Write combined code tree + file contents
-    with open(code_file, "w", encoding="utf-8") as f:
-        f.write(final_content)
+    # Stream directory tree + file contents into code.txt and, in the same
+    # pass, one compact JSON object per file into metadata.json, so file
+    # contents are never all held in memory at once. code.txt is written in
+    # binary mode: contents are already UTF-8 bytes and go out unchanged.
+    with open(code_file, "wb") as out, \
+            open(metadata_file, "w", encoding="utf-8") as mf:
+        out.write(directory_tree.encode("utf-8"))
+        out.write(b"\n\n")
+        mf.write('{"files": [')
+        count = 0
+        for f in files:
+            if count:
+                out.write(b"\n")
+            out.write(_SEPARATOR)
+            out.write(
+                f"File: {f['path']} ({f['lines']} lines, {f['size']} bytes)\n".encode("utf-8")
+            )
+            out.write(_SEPARATOR)
+            out.write(f['content'])
+            out.write(b"\n")
 
-    # Write metadata (in JSON format, but the file is named metadata.txt)
-    metadata = {"files": files}
-    with open(metadata_file, "w", encoding="utf-8") as mf:
-        mf.write(json.dumps(metadata, indent=2))
+            mf.write(",\n" if count else "\n")
+            json.dump(f, mf, separators=(",", ":"), default=_decode_content)
+            # Unmap large files now rather than when the next file rebinds f
+            if isinstance(f['content'], mmap.mmap):
+                f['content'].close()
+            count += 1
+        mf.write("\n]}" if count else "]}")
 
     logging.info(color_text(
         f"Content extracted:\n  {code_file}\n  {metadata_file}",
@@ -63,7 +83,6 @@ def extract_repo_content(
     exclude,
     select,
     branch,
-    verbose: bool,
     dry_run: bool,
     ignore_hidden: bool,
 ) -> None:
@@ -76,7 +95,7 @@ def extract_repo_content(
     if not dry_run:
         os.makedirs(output_folder, exist_ok=True)
 
-    if input_path.startswith(("http://", "https://")):
+    if input_path.startswith(URL_PREFIXES):
         # It's a remote repo
         logging.info(color_text(f"Detected remote repository: {input_path}", YELLOW))
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -86,7 +105,6 @@ def extract_repo_content(
                 repo_dir,
                 exclude,
                 select,
-                verbose,
                 dry_run,
                 ignore_hidden,
                 output_folder
@@ -99,7 +117,6 @@ def extract_repo_content(
             input_path,
             exclude,
             select,
-            verbose,
             dry_run,
             ignore_hidden,
             output_folder
@@ -1,26 +1,17 @@
-import os
 import logging
-from fnmatch import fnmatchcase
-from utils.color import color_text, YELLOW
+from utils.color import YELLOW, RESET
 
 def should_exclude(
-    path: str,
-    base_path: str,
-    exclude_patterns,
-    verbose: bool = False
+    rel_path: str,
+    exclude_match
 ) -> bool:
     """
-    Check if a file should be excluded based on patterns.
+    Check if a file should be excluded using a compiled pattern matcher.
     """
-    rel_path = os.path.relpath(path, start=base_path)
-    for pattern in exclude_patterns:
-        if fnmatchcase(rel_path, pattern):
-            if verbose:
-                logging.debug(color_text(
-                    f"Excluded: {rel_path} (matches pattern '{pattern}')",
-                    YELLOW
-                ))
-            return True
+    if exclude_match is not None and exclude_match(rel_path):
+        logging.debug(
+            "%sExcluded: %s (matches exclude patterns)%s", YELLOW, rel_path, RESET
+        )
+        return True
     return False
 
-
@@ -1,28 +1,21 @@
-import os
 import logging
-from fnmatch import fnmatchcase
-from utils.color import color_text, GREEN
+from utils.color import GREEN, RESET
 
 
 def should_include(
-    path: str,
-    base_path: str,
-    include_patterns,
-    verbose: bool = False
+    rel_path: str,
+    include_match
 ) -> bool:
     """
-    Check if a file should be included based on patterns.
+    Check if a file should be included using a compiled pattern matcher.
+    No matcher means no select patterns were given, so everything is included.
     """
-    if not include_patterns:
+    if include_match is None:
         return True
 
-    rel_path = os.path.relpath(path, start=base_path)
-    for pattern in include_patterns:
-        if fnmatchcase(rel_path, pattern):
-            if verbose:
-                logging.debug(color_text(
-                    f"Included: {rel_path} (matches pattern '{pattern}')",
-                    GREEN
-                ))
-            return True
-    return False
\ No newline at end of file
+    if include_match(rel_path):
+        logging.debug(
+            "%sIncluded: %s (matches select patterns)%s", GREEN, rel_path, RESET
+        )
+        return True
+    return False
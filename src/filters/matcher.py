@@ -0,0 +1,74 @@
+import re
+from fnmatch import translate
+from functools import lru_cache
+from typing import Callable, Iterable, Optional
+
+_MAGIC_CHARS = frozenset("*?[")
+
+
+def _is_literal(pattern: str) -> bool:
+    """
+    True when the pattern contains no glob wildcards.
+    """
+    return not _MAGIC_CHARS.intersection(pattern)
+
+
+def dir_name_literals(patterns: Iterable[str]) -> frozenset:
+    """
+    Bare names among the patterns (no wildcards, no path separator).
+
+    These are matched against a directory's own name, so e.g. `node_modules`
+    prunes that directory at any depth without running the full matcher.
+    """
+    return frozenset(
+        p for p in patterns
+        if p and "/" not in p and _is_literal(p)
+    )
+
+
+def build_matcher(patterns: Iterable[str]) -> Optional[Callable[[str], bool]]:
+    """
+    Compile glob patterns once into a fast matcher.
+
+    Patterns are partitioned at build time: literals become a set lookup,
+    plain `*.ext` patterns become a single `str.endswith` call, and only the
+    remaining patterns are joined into one compiled regex union. Returns a
+    callable taking a relative path, or None when no patterns are given.
+    """
+    return _compile_matcher(tuple(patterns))
+
+
+@lru_cache(maxsize=64)
+def _compile_matcher(patterns: tuple) -> Optional[Callable[[str], bool]]:
+    """
+    Build the matcher for a pattern tuple; cached so repeated scans with the
+    same patterns reuse the compiled regex.
+    """
+    literals = set()
+    suffixes = []
+    general = []
+    for pattern in patterns:
+        if _is_literal(pattern):
+            literals.add(pattern)
+        elif pattern.startswith("*.") and pattern[2:].isalnum():
+            suffixes.append(pattern[1:])
+        else:
+            general.append(pattern)
+
+    if not (literals or suffixes or general):
+        return None
+
+    suffixes = tuple(suffixes)
+    regex = (
+        re.compile("|".join(f"(?:{translate(p)})" for p in general))
+        if general else None
+    )
+
+    def match(rel_path: str) -> bool:
+        return (
+            rel_path in literals
+            or rel_path.endswith(suffixes)
+            or (regex is not None and regex.match(rel_path) is not None)
+        )
+
+    return match
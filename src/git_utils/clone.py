@@ -1,12 +1,150 @@
+import io
+import os
+import http.client
+import re
+import shutil
 import subprocess
 import logging
-from utils.color import color_text, RED
+import tarfile
+import urllib.error
+import urllib.request
+from utils.color import color_text, RED, YELLOW
+
+try:
+    # Optional: in-process clones without spawning git
+    from dulwich import porcelain
+except ImportError:
+    porcelain = None
+
+_GITHUB_URL = re.compile(
+    r"^https?://(?:www\.)?github\.com/([^/]+)/([^/]+?)(?:\.git)?/?$"
+)
+
+# Seconds without data before a stalled archive download is abandoned
+_ARCHIVE_TIMEOUT = 60
+
+# .gitattributes attributes that make `git archive` differ from a checkout
+_EXPORT_ATTRS = frozenset({"export-ignore", "export-subst"})
+
+def _uses_export_attrs(lines) -> bool:
+    """
+    True if the lines of a .gitattributes file set export-ignore or export-subst.
+    """
+    for line in lines:
+        fields = line.split()
+        if fields and not fields[0].startswith("#") \
+                and _EXPORT_ATTRS.intersection(fields[1:]):
+            return True
+    return False
+
+def _fetch_root_gitattributes(owner: str, repo: str, ref: str) -> list:
+    """
+    Lines of the ref's top-level .gitattributes, or [] if it has none.
+    Fetched from the real tree, since it may export-ignore itself.
+    """
+    url = f"https://raw.githubusercontent.com/{owner}/{repo}/{ref}/.gitattributes"
+    try:
+        with urllib.request.urlopen(url, timeout=_ARCHIVE_TIMEOUT) as resp:
+            return resp.read().decode("utf-8", "ignore").splitlines()
+    except urllib.error.HTTPError as e:
+        if e.code == 404:
+            return []
+        raise
+
+def _extract_github_tarball(owner: str, repo: str, branch: str, target_dir: str) -> bool:
+    """
+    Stream a GitHub tarball of the given ref straight into target_dir.
+
+    Tarballs are built by `git archive`, which drops export-ignore paths and
+    rewrites export-subst files. Returns False when the root .gitattributes,
+    or one in the archive, uses either, since the extraction then doesn't
+    match a clone of the ref.
+    """
+    ref = branch or "HEAD"
+    if _uses_export_attrs(_fetch_root_gitattributes(owner, repo, ref)):
+        return False
+
+    url = f"https://codeload.github.com/{owner}/{repo}/tar.gz/{ref}"
+    logging.info(f"Downloading repository archive: {url}")
+
+    # Python versions with extraction filters get the safe 'data' filter
+    extract_kwargs = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+
+    attr_files = []
+    with urllib.request.urlopen(url, timeout=_ARCHIVE_TIMEOUT) as resp:
+        with tarfile.open(fileobj=resp, mode="r|gz") as tar:
+            for member in tar:
+                # Archives wrap everything in a single '<repo>-<ref>/' directory
+                _, sep, name = member.name.partition("/")
+                if not sep or not name:
+                    continue
+                if os.path.isabs(name) or ".." in name.split("/"):
+                    continue
+                member.name = name
+                tar.extract(member, target_dir, **extract_kwargs)
+                if member.isfile() and os.path.basename(name) == ".gitattributes":
+                    attr_files.append(os.path.join(target_dir, name))
+
+    for attr_path in attr_files:
+        with open(attr_path, encoding="utf-8", errors="ignore") as f:
+            if _uses_export_attrs(f):
+                return False
+    return True
+
+def _clone_with_dulwich(url: str, target_dir: str, branch: str = None):
+    """
+    Shallow-clone in-process with dulwich.
+    """
+    logging.info(f"Cloning repository with dulwich: {url}")
+    porcelain.clone(
+        url,
+        target_dir,
+        depth=1,
+        branch=branch.encode() if branch else None,
+        errstream=io.BytesIO(),
+    )
 
 def clone_repo(url: str, target_dir: str, branch: str = None):
     """
-    Clone a remote Git repository into target_dir using a shallow clone.
+    Fetch a remote Git repository's files into target_dir.
+
+    GitHub URLs are downloaded as a tarball of the requested ref, which moves
+    less data than a clone and contains no .git directory. Anything else, a
+    failed download (e.g. a private repository), or a tarball shaped by
+    .gitattributes export attributes, is cloned in-process with
+    dulwich when it is installed, and otherwise (or if dulwich fails) with a
+    shallow, blobless, single-branch git clone.
     """
-    cmd = ["git", "clone", "--depth=1"]
+    match = _GITHUB_URL.match(url)
+    if match:
+        owner, repo = match.groups()
+        try:
+            if _extract_github_tarball(owner, repo, branch, target_dir):
+                return
+            logging.info(
+                "Archive omits or rewrites files via .gitattributes, "
+                "falling back to a clone"
+            )
+        except (urllib.error.URLError, http.client.HTTPException,
+                tarfile.TarError, OSError) as e:
+            logging.warning(color_text(
+                f"Archive download failed ({e}), falling back to a clone",
+                YELLOW
+            ))
+        shutil.rmtree(target_dir, ignore_errors=True)
+
+    if porcelain is not None:
+        try:
+            _clone_with_dulwich(url, target_dir, branch)
+            return
+        except Exception as e:
+            logging.warning(color_text(
+                f"dulwich clone failed ({e}), falling back to git",
+                YELLOW
+            ))
+            shutil.rmtree(target_dir, ignore_errors=True)
+
+    cmd = ["git", "clone", "--depth=1", "--filter=blob:none", "--single-branch"]
     if branch:
         cmd += ["--branch", branch]
     cmd += [url, target_dir]
@@ -21,7 +21,6 @@ def main():
             exclude=args.exclude,
             select=args.select,
             branch=args.branch,
-            verbose=args.verbose,
             dry_run=args.dry_run,
             ignore_hidden=args.ignore_hidden,
         )
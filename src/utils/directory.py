@@ -1,87 +1,153 @@
 import os
 import logging
-from functools import partial
 
-from utils.color import color_text, GREEN
-from utils.filesystem import is_text_file, read_file_content
+from utils.color import GREEN, YELLOW, RESET
+from utils.filesystem import has_binary_extension, read_files_bulk
 from filters.exclude import should_exclude
 from filters.include import should_include
+from filters.matcher import build_matcher, dir_name_literals
 
 
-def build_directory_tree_lines(dir_path: str, prefix: str = ""):
+def _sorted_entries(dir_path: str):
     """
-    Recursively create lines for a directory tree.
+    List a directory once with scandir, sorted by name and without .git.
     """
+    with os.scandir(dir_path) as it:
+        return sorted((e for e in it if e.name != ".git"), key=lambda e: e.name)
+
+def _push_children(stack, entries, rel_root: str, prefix: str):
+    """
+    Push a directory's entries so they pop in order, each with its tree line.
+    """
+    last = len(entries) - 1
+    for i in range(last, -1, -1):
+        entry = entries[i]
+        connector = "└── " if i == last else "├── "
+        child_prefix = prefix + ("    " if i == last else "│   ")
+        rel_path = f"{rel_root}/{entry.name}" if rel_root else entry.name
+        stack.append((entry, rel_path, prefix + connector + entry.name, child_prefix))
+
+def _walk(
+    path: str,
+    exclude_patterns,
+    include_patterns,
+    ignore_hidden: bool
+):
+    """
+    Single pass over the tree: returns (tree_lines, candidates).
+
+    Entries are visited depth-first in name order using an explicit stack.
+    Every entry of a visited directory gets a tree line; excluded or hidden
+    directories are listed but not descended into. Candidates are
+    (DirEntry, rel_path) pairs for files that passed the filters.
+    """
+    # Compile the patterns once for the whole walk
+    exclude_match = build_matcher(exclude_patterns)
+    include_match = build_matcher(include_patterns)
+    # Directory names pruned by a set lookup before any path matching
+    skip_dirs = dir_name_literals(exclude_patterns)
+
+    lines = []
+    candidates = []
+    stack = []
     try:
-        entries = sorted(e for e in os.listdir(dir_path) if e != ".git")
+        _push_children(stack, _sorted_entries(path), "", "")
     except PermissionError:
-        return [prefix + "[Permission Denied]"]
+        lines.append("[Permission Denied]")
 
-    lines = []
-    for i, entry in enumerate(entries):
-        connector = "└── " if i == len(entries) - 1 else "├── "
-        full_path = os.path.join(dir_path, entry)
-        lines.append(prefix + connector + entry)
+    while stack:
+        entry, rel_path, line, child_prefix = stack.pop()
+        lines.append(line)
+
+        # Filters run cheapest first: a char compare for hidden entries, set
+        # lookups for names and extensions, and path matching last
+        if ignore_hidden and entry.name[0] == '.':
+            continue
+
+        if entry.is_dir(follow_symlinks=False):
+            if entry.name in skip_dirs:
+                logging.debug("%sExcluded: %s (directory name)%s", YELLOW, rel_path, RESET)
+                continue
+            if should_exclude(rel_path, exclude_match):
+                continue
+            try:
+                children = _sorted_entries(entry.path)
+            except PermissionError:
+                lines.append(child_prefix + "[Permission Denied]")
+                continue
+            except OSError:
+                continue
+            _push_children(stack, children, rel_path, child_prefix)
+            continue
+
+        if (
+            not entry.is_file()
+            or has_binary_extension(entry.name)
+            or should_exclude(rel_path, exclude_match)
+            or not should_include(rel_path, include_match)
+        ):
+            continue
 
-        if os.path.isdir(full_path):
-            new_prefix = prefix + ("    " if i == len(entries) - 1 else "│   ")
-            lines.extend(build_directory_tree_lines(full_path, new_prefix))
+        candidates.append((entry, rel_path))
 
-    return lines
+    return lines, candidates
 
-def create_directory_tree(path: str) -> str:
+# Slice size for counting newlines in memory-mapped contents
+_COUNT_CHUNK = 1 << 20
+
+def _count_lines(content) -> int:
     """
-    Creates a human-readable directory tree as a single string.
+    Count lines in raw contents without building a list of lines.
+    mmap has no count(), so mapped files are counted in bounded slices.
     """
-    lines = build_directory_tree_lines(path)
-    return "Directory structure:\n" + "\n".join(lines)
+    if not content:
+        return 0
+    if isinstance(content, bytes):
+        newlines = content.count(b"\n")
+    else:
+        newlines = sum(
+            content[i:i + _COUNT_CHUNK].count(b"\n")
+            for i in range(0, len(content), _COUNT_CHUNK)
+        )
+    return newlines + (content[-1:] != b"\n")
+
+def _iter_files(candidates):
+    """
+    Yield file infos for the text candidates, in walk order.
+    The content is kept as the file's raw UTF-8 bytes (or an mmap of them).
+    """
+    # Entries are stat'ed by the pool workers; the main thread only reads
+    # the size back from each entry's cache
+    contents = read_files_bulk(entry for entry, _ in candidates)
+    for (entry, rel_path), (_, content) in zip(candidates, contents):
+        if content is None:
+            continue
+
+        logging.debug("%sProcessed file: %s%s", GREEN, rel_path, RESET)
+        yield {
+            "path": rel_path,
+            "content": content,
+            "size": entry.stat().st_size,
+            "lines": _count_lines(content),
+        }
 
 def scan_directory(
     path: str,
     exclude_patterns,
     include_patterns,
-    verbose: bool,
     ignore_hidden: bool
 ):
     """
-    Walk through the directory, collecting valid text files.
-    """
-    all_files = []
-    for root, dirs, files in os.walk(path):
-        exclude_fn = partial(
-            should_exclude,
-            base_path=path,
-            exclude_patterns=exclude_patterns,
-            verbose=verbose
-        )
+    Walk through the directory once, returning (directory_tree, files).
 
-        # Filter out hidden dirs if needed
-        if ignore_hidden:
-            dirs[:] = [d for d in dirs if not d.startswith('.')]
-        # Remove excluded dirs
-        dirs[:] = [d for d in dirs if not exclude_fn(os.path.join(root, d))]
-
-        # Filter out hidden files if requested
-        if ignore_hidden:
-            files = [f for f in files if not f.startswith('.')]
-
-        for fname in files:
-            file_path = os.path.join(root, fname)
-            if (
-                not exclude_fn(file_path)
-                and should_include(file_path, path, include_patterns, verbose)
-                and is_text_file(file_path)
-            ):
-                content = read_file_content(file_path)
-                file_info = {
-                    "path": os.path.relpath(file_path, start=path),
-                    "content": content,
-                    "size": os.path.getsize(file_path),
-                    "lines": len(content.splitlines()),
-                }
-                all_files.append(file_info)
-
-                if verbose:
-                    logging.debug(color_text(f"Processed file: {file_path}", GREEN))
-
-    return all_files
+    The directory tree is a human-readable string built during the walk;
+    files is a generator yielding valid text files in the same order.
+    """
+    lines, candidates = _walk(
+        path,
+        exclude_patterns,
+        include_patterns,
+        ignore_hidden
+    )
+    directory_tree = "Directory structure:\n" + "\n".join(lines)
+    return directory_tree, _iter_files(candidates)
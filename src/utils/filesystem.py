@@ -1,35 +1,372 @@
 import os
+import stat
+import sys
+import codecs
+import mmap
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Iterable, Iterator, Optional, Tuple, Union
 
-def is_text_file(file_path: str) -> bool:
+# Prefixes that mark an input as a remote repository URL
+URL_PREFIXES = ("http://", "https://")
+
+# Component separators used by get_repo_name for URLs and local paths
+_URL_SEPS = ("/",)
+_PATH_SEPS = (os.sep, os.altsep) if os.altsep else (os.sep,)
+
+# Repo names shorter than this are interned by get_repo_name
+_INTERN_MAX_LEN = 256
+
+# Extensions that are always treated as text by is_text_file (never sniffed)
+_TEXT_EXTS = frozenset({
+    "py", "pyi", "js", "jsx", "mjs", "cjs", "ts", "tsx", "vue", "svelte",
+    "md", "rst", "txt", "json", "yaml", "yml", "toml", "ini", "cfg", "conf",
+    "xml", "html", "htm", "css", "scss", "sass", "less", "csv", "tsv", "sh",
+    "bash", "zsh", "fish", "ps1", "bat", "c", "h", "cc", "cpp", "cxx", "hpp",
+    "hh", "cs", "java", "kt", "kts", "scala", "go", "rs", "rb", "php", "pl",
+    "pm", "lua", "swift", "r", "sql", "graphql", "proto", "tf", "cmake",
+    "gradle",
+})
+
+# Extensions that are always treated as binary (never opened)
+_BINARY_EXTS = frozenset({
+    "png", "jpg", "jpeg", "gif", "bmp", "ico", "webp", "tif", "tiff", "psd",
+    "pdf", "zip", "gz", "tgz", "bz2", "xz", "zst", "7z", "rar", "tar", "whl",
+    "egg", "jar", "war", "class", "so", "dll", "dylib", "exe", "o", "a", "lib",
+    "obj", "pyc", "pyo", "pyd", "wasm", "woff", "woff2", "ttf", "otf", "eot",
+    "mp3", "mp4", "wav", "ogg", "flac", "avi", "mov", "mkv", "webm", "sqlite",
+    "db", "npy", "npz", "pkl", "parquet",
+})
+
+# Bytes inspected by the binary sniff
+_SNIFF_SIZE = 4096
+
+# Bytes expected in text: common control characters (BEL, BS, TAB, LF, VT,
+# FF, CR, ESC) and everything from 0x20 up except DEL, which covers UTF-8
+_TEXT_CHARS = bytes({7, 8, 9, 10, 11, 12, 13, 27} | set(range(0x20, 0x100)) - {0x7f})
+
+# Share of other control bytes above which a sniffed chunk counts as binary
+_MAX_CONTROL_RATIO = 0.30
+
+# Per-thread scratch buffer reused by every is_text_file sniff
+_sniff_local = threading.local()
+
+# Chunk size for reads past the stat'd size (unknown size, or file grew)
+_READ_CHUNK = 1 << 16
+
+# Files at least this large are memory-mapped instead of copied into bytes
+_MMAP_THRESHOLD = 1 << 16
+
+# O_NOATIME where available; cleared by _open_readonly after the first EPERM
+_noatime_flag = getattr(os, "O_NOATIME", 0)
+
+def _extension(name: str) -> str:
+    """
+    Lower-cased extension of a file name without the dot ('' if none).
+    Dotfiles such as '.env' have no extension.
+    """
+    head, dot, ext = name.rpartition(".")
+    return ext.lower() if dot and head else ""
+
+def _open_readonly(file_path: str) -> int:
+    """
+    Open a file for raw reading and return its descriptor.
+
+    O_NOATIME (Linux) avoids an inode atime write per read, but is only
+    permitted on files the caller owns. After the first EPERM it is dropped
+    for the rest of the process, so files owned by another user don't cost
+    two opens each. O_SEQUENTIAL (Windows) asks for sequential-scan caching.
+    """
+    global _noatime_flag
+    flags = (
+        os.O_RDONLY
+        | getattr(os, "O_BINARY", 0)
+        | getattr(os, "O_SEQUENTIAL", 0)
+    )
+    if _noatime_flag:
+        try:
+            return os.open(file_path, flags | _noatime_flag)
+        except PermissionError:
+            _noatime_flag = 0
+    return os.open(file_path, flags)
+
+def has_binary_extension(name: str) -> bool:
+    """
+    Checks if a file name has an extension known to be binary, so the file
+    can be skipped without opening it.
+    """
+    return _extension(name) in _BINARY_EXTS
+
+def _looks_like_text(chunk, n: int) -> bool:
+    """
+    Control-byte density check over the first n bytes of a sniffed chunk
+    (as used by git and file(1)): the share of unexpected control bytes,
+    counted in one C-level translate(), must stay below 30%. Callers have
+    already rejected chunks containing a NUL with a bounded find().
+    """
+    if not n:
+        return True
+    # translate() has no bounds: slice only when the chunk is longer than n
+    # or has no translate() of its own (mmap)
+    if n != len(chunk) or not isinstance(chunk, (bytes, bytearray)):
+        chunk = chunk[:n]
+    control = len(chunk.translate(None, _TEXT_CHARS))
+    return control / n < _MAX_CONTROL_RATIO
+
+def _sniff_buffer() -> bytearray:
+    """
+    This thread's reusable sniff buffer, allocated on first use.
+    """
+    buf = getattr(_sniff_local, "buf", None)
+    if buf is None:
+        buf = _sniff_local.buf = bytearray(_SNIFF_SIZE)
+    return buf
+
+@lru_cache(maxsize=65536)
+def _is_text_by_stat(dev: int, ino: int, mtime_ns: int, size: int, file_path: str) -> bool:
+    """
+    Sniff a file, memoized on its identity: any change to the inode, mtime or
+    size produces a new key, so stale results are never returned. OSError
+    propagates, so transient failures are not cached.
+    """
+    fd = _open_readonly(file_path)
+    try:
+        if hasattr(os, "readv"):
+            # Read into the thread's scratch buffer: no bytes per call
+            chunk = _sniff_buffer()
+            n = os.readv(fd, [chunk])
+        else:
+            chunk = os.read(fd, _SNIFF_SIZE)
+            n = len(chunk)
+    finally:
+        os.close(fd)
+    # Cheap NUL scan on the reused buffer first, density check only for text
+    if chunk.find(b'\x00', 0, n) != -1:
+        return False
+    return _looks_like_text(chunk, n)
+
+def is_text_file(file: Union[str, os.DirEntry]) -> bool:
     """
-    Checks if a file is likely text by looking for null bytes in the first 1KB.
+    Checks if a regular file (path or DirEntry) is likely text: well-known
+    extensions decide by name alone, others are sniffed and cached by stat.
     """
+    if isinstance(file, os.DirEntry):
+        file_path, name = file.path, file.name
+    else:
+        file_path, name = file, os.path.basename(file)
+
+    ext = _extension(name)
+    if ext in _BINARY_EXTS:
+        return False
+
     try:
-        with open(file_path, 'rb') as f:
-            chunk = f.read(1024)
-        return b'\x00' not in chunk
-    except Exception:
+        if isinstance(file, os.DirEntry):
+            # is_file() comes from the directory listing; stat only to sniff
+            if not file.is_file():
+                return False
+            if ext in _TEXT_EXTS:
+                return True
+            st = file.stat()
+        else:
+            st = os.stat(file_path)
+            if not stat.S_ISREG(st.st_mode):
+                return False
+            if ext in _TEXT_EXTS:
+                return True
+        return _is_text_by_stat(st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size, file_path)
+    except OSError:
         return False
 
+def read_file_bytes(file_path: str) -> bytes:
+    """
+    Read a file's raw bytes in one sized os.read, raising OSError on failure.
+    Use this when the contents go to another UTF-8 sink: writing the bytes
+    as-is skips a decode and a re-encode per file.
+    """
+    return _read_buffer(file_path, allow_mmap=False)
+
 def read_file_content(file_path: str) -> str:
     """
     Safely read file content, ignoring errors, returns a placeholder on failure.
+    The file is read like read_file_bytes() and decoded once, except that
+    large files are decoded straight from a read-only mapping, which is
+    unmapped right after, instead of first being copied into bytes.
+    """
+    try:
+        data = _read_buffer(file_path)
+        if isinstance(data, mmap.mmap):
+            with data:
+                return str(data, 'utf-8', 'ignore')
+        return str(data, 'utf-8', 'ignore')
+    except OSError as e:
+        return f"Error reading file {file_path}: {e}"
+
+def iter_file_lines(file_path: str, chunk_size: int = _READ_CHUNK) -> Iterator[str]:
+    """
+    Lazily yield a file's lines (without their trailing newline), decoding
+    UTF-8 chunk by chunk with errors ignored. Memory is O(chunk_size plus
+    the longest line) instead of O(file size); raises OSError if the file
+    cannot be read.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    fd = _open_readonly(file_path)
+    try:
+        # Pieces of the unfinished line, joined once its newline arrives, so
+        # long lines are not re-copied and re-split on every chunk
+        pending = []
+        while True:
+            data = os.read(fd, chunk_size)
+            text = decoder.decode(data, final=not data)
+            lines = text.split("\n")
+            if len(lines) > 1:
+                pending.append(lines[0])
+                yield "".join(pending)
+                pending = []
+                yield from lines[1:-1]
+            if lines[-1]:
+                pending.append(lines[-1])
+            if not data:
+                if pending:
+                    yield "".join(pending)
+                return
+    finally:
+        os.close(fd)
+
+def _read_buffer(
+    file_path: str,
+    size: Optional[int] = None,
+    allow_mmap: bool = True
+) -> Union[bytes, mmap.mmap]:
+    """
+    Read a whole file with raw os.open/os.read, sized from a prior stat, or
+    from os.fstat on the open descriptor when no size is given. Skips the
+    buffered reader and its read-all growth loop. Unless allow_mmap is False,
+    files of at least _MMAP_THRESHOLD bytes are returned as a read-only mmap
+    instead, so their contents are paged in by the kernel rather than copied
+    into a bytes object.
+    """
+    fd = _open_readonly(file_path)
+    try:
+        if size is None:
+            size = os.fstat(fd).st_size
+
+        # Ask the kernel for aggressive readahead and to start paging the
+        # whole file in now; the advice values are not flags, hence two calls.
+        # Smaller files are read whole by the single os.read below, where the
+        # hints cannot help
+        if size >= _MMAP_THRESHOLD and hasattr(os, "posix_fadvise"):
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            except OSError:
+                pass
+
+        if allow_mmap and size >= _MMAP_THRESHOLD:
+            try:
+                mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # File was truncated to zero length since the stat
+                return b""
+            except OSError:
+                # Filesystem cannot map it (e.g. ENODEV, ENOMEM): read instead
+                mm = None
+            if mm is not None:
+                if hasattr(mm, "madvise"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                return mm
+
+        data = os.read(fd, size) if size > 0 else b""
+        if size > 0 and len(data) == size:
+            return data
+
+        # Short read or unknown size: read the rest until EOF
+        chunks = [data]
+        while True:
+            chunk = os.read(fd, _READ_CHUNK)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b"".join(chunks)
+    finally:
+        os.close(fd)
+
+def read_if_text(
+    file: Union[str, os.DirEntry],
+    size: Optional[int] = None
+) -> Optional[Union[bytes, mmap.mmap]]:
+    """
+    Read a path or DirEntry once and return its raw content (bytes, or an
+    mmap for large files), or None if its first 4KB sniff as binary.
     """
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            return f.read()
-    except Exception as e:
-        return f"Error reading file {file_path}: {str(e)}"
+        if isinstance(file, os.DirEntry):
+            if size is None:
+                size = file.stat().st_size
+            file = file.path
+        data = _read_buffer(file, size)
+    except OSError:
+        return None
+
+    # Bounded NUL scan on the buffer itself, density check only for text
+    n = min(len(data), _SNIFF_SIZE)
+    if data.find(b'\x00', 0, n) != -1 or not _looks_like_text(data, n):
+        if isinstance(data, mmap.mmap):
+            data.close()
+        return None
+    return data
+
+def read_files_bulk(
+    files: Iterable[Union[str, os.DirEntry]]
+) -> Iterator[Tuple[Union[str, os.DirEntry], Optional[Union[bytes, mmap.mmap]]]]:
+    """
+    Run read_if_text over many paths or DirEntry objects on a thread pool.
+
+    Reads are I/O-bound and release the GIL, so overlapping them hides disk
+    latency. Yields (file, content) in input order; only a bounded window of
+    reads is in flight, so contents reach the caller as they are read.
+    """
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        for file in files:
+            pending.append((file, executor.submit(read_if_text, file)))
+            if len(pending) >= max_workers * 2:
+                done, future = pending.popleft()
+                yield done, future.result()
+        while pending:
+            done, future = pending.popleft()
+            yield done, future.result()
 
 def get_repo_name(path_or_url: str) -> str:
     """
     Extract repository name from a GitHub URL or local path.
+
+    One backwards pass for both kinds of input: skip trailing separators,
+    rfind the start of the last component, drop a '.git' suffix for URLs,
+    and slice once. Short names are interned, since they are reused as keys
+    (e.g. the output folder) and compare by identity once interned.
     """
-    if path_or_url.startswith(("http://", "https://")):
-        trimmed = path_or_url.rstrip("/")
-        parts = trimmed.split("/")
-        repo = parts[-1]
-        if repo.endswith(".git"):
-            repo = repo[:-4]
-        return repo
-    return os.path.basename(os.path.normpath(path_or_url))
+    is_url = path_or_url.startswith(URL_PREFIXES)
+    seps = _URL_SEPS if is_url else _PATH_SEPS
+
+    end = len(path_or_url)
+    while end > 1 and path_or_url[end - 1] in seps:
+        end -= 1
+    start = path_or_url.rfind(seps[0], 0, end)
+    if len(seps) > 1:
+        start = max(start, path_or_url.rfind(seps[1], 0, end))
+    start += 1
+
+    if is_url:
+        if end - start >= 4 and path_or_url.endswith(".git", start, end):
+            end -= 4
+        name = path_or_url[start:end]
+    else:
+        name = path_or_url[start:end]
+        if not name or name in (".", ".."):
+            # Relative components need real normalization
+            name = os.path.basename(os.path.normpath(path_or_url))
+
+    return sys.intern(name) if len(name) < _INTERN_MAX_LEN else name